@@ -10,8 +10,21 @@ import os
 import sys
 import json
 import argparse
+import asyncio
+import functools
+import hashlib
+import io
 import logging
-from typing import Dict, List, Any, Optional
+import logging.handlers
+import mmap
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Coroutine, Dict, List, Any, Optional, Tuple
+
+import numpy as np
 
 # Placeholder for Google Cloud Vision API
 try:
@@ -30,33 +43,205 @@ except ImportError:
     GEMINI_AVAILABLE = False
     print("Gemini API not available. Install with: pip install google-generativeai")
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("scene_validator.log"),
-        logging.StreamHandler()
-    ]
-)
+# Pillow is used to downscale frames before upload
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+    print("Pillow not available, frames will be uploaded at full size. Install with: pip install Pillow")
+
+# orjson is an optional, faster drop-in for the stdlib json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger("SceneValidator")
 
+# Number of log records buffered in memory before they are written to the log file
+LOG_BUFFER_CAPACITY = 1024
+
+# Default cap on in-flight Vision/Gemini requests
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Maximum number of images the Vision API accepts per batch_annotate_images call
+VISION_BATCH_SIZE = 16
+
+# Cap on localized objects returned per frame, bounding response size and parse time
+VISION_MAX_OBJECTS = 20
+
+# Frames are downscaled so their longest side is at most this many pixels before upload
+DEFAULT_MAX_DIM = 1280
+DOWNSCALE_JPEG_QUALITY = 85
+
+# On-disk cache of API results, keyed by SHA-256 of the image bytes
+DEFAULT_CACHE_DIR = "~/.scene_validator_cache"
+DEFAULT_CACHE_MAX_BYTES = 100 * 1024 * 1024
+
+# Cache writes between size checks when the cache is used outside validate_scene_sequence
+CACHE_EVICT_INTERVAL = 256
+
+# Temporary cache files older than this are leftovers from interrupted writes
+STALE_TMP_SECONDS = 60 * 60
+
+
+async def _bounded_gather(coros: List[Coroutine], limit: int) -> List[Any]:
+    """Run coroutines concurrently with at most `limit` in flight.
+
+    Pass unstarted coroutines: futures (e.g. from run_in_executor) are already
+    running when created, so the limit could not hold them back.
+    Results are returned in the same order as `coros`.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(coro: Coroutine) -> Any:
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(_run(coro) for coro in coros))
+
+def _loads(data: Any) -> Any:
+    """Decode JSON from str or bytes, using orjson when available.
+    
+    Raises a json.JSONDecodeError (orjson's error subclasses it) on invalid input.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Any, indent: bool = False) -> str:
+    """Encode obj as JSON, pretty-printed with two-space indentation if requested.
+    
+    Non-ASCII text is written as-is when orjson is used, so write the result
+    out as UTF-8.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+        except TypeError:
+            # orjson rejects some values the stdlib accepts, such as integers
+            # wider than 64 bits in stdlib-parsed Gemini JSON
+            pass
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+# Markdown code fences Gemini often wraps its JSON answers in
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.M)
+
+
+def _first_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """Decode the first JSON object embedded anywhere in text."""
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    while start != -1:
+        try:
+            value, _ = decoder.raw_decode(text, start)
+            if isinstance(value, dict):
+                return value
+        except json.JSONDecodeError:
+            pass
+        start = text.find("{", start + 1)
+    return None
+
+
+def _parse_json_response(text: str) -> Optional[Dict[str, Any]]:
+    """Extract a JSON object from a model response, tolerating code fences and surrounding prose."""
+    try:
+        value = _loads(_FENCE.sub("", text).strip())
+        if isinstance(value, dict):
+            return value
+    except json.JSONDecodeError:
+        pass
+    return _first_json_object(text)
+
+
+@functools.lru_cache(maxsize=1)
+def _vision_client(project_id: str) -> Any:
+    """Vision client shared by validators for the same project.
+    
+    Creating a client sets up a gRPC channel (including the TLS handshake), and
+    the client is safe to use from multiple threads.
+    """
+    return vision.ImageAnnotatorClient()
+
+
+@functools.lru_cache(maxsize=1)
+def _gemini_model(api_key: str, model_name: str = 'gemini-pro-vision') -> Any:
+    """Gemini model shared by validators using the same API key.
+    
+    genai.configure is process-global, so only the most recent key is kept;
+    switching keys re-runs the configuration.
+    """
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name)
+
+
+# (cache key, cached result, upload bytes) as returned by SceneValidator._fetch
+_Fetched = Tuple[Optional[str], Optional[Dict[str, Any]], Optional[bytes]]
+
+
+def _quantize_rgb(colors: List[List[float]]) -> np.ndarray:
+    """Round RGB triplets in the 0-255 range to a (k, 3) uint8 array."""
+    rgb = np.asarray(colors, dtype=np.float32).reshape(-1, 3)
+    return np.clip(np.rint(rgb), 0, 255).astype(np.uint8)
+
+
 class SceneValidator:
     """Main class for validating scene composition and continuity."""
     
-    def __init__(self, api_key: Optional[str] = None, project_id: Optional[str] = None):
+    __slots__ = (
+        "api_key", "project_id", "max_concurrency", "cache_dir", "cache_max_bytes",
+        "include_labels", "max_dim", "_vision_cache_prefix", "_gemini_cache_prefix",
+        "vision_client", "gemini_model",
+        "_cache_lock", "_cache_writes",
+    )
+    
+    def __init__(self, api_key: Optional[str] = None, project_id: Optional[str] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 include_labels: bool = False,
+                 max_dim: Optional[int] = DEFAULT_MAX_DIM):
         """Initialize the SceneValidator.
         
         Args:
             api_key: Gemini API key
             project_id: Google Cloud project ID
+            max_concurrency: Maximum number of API requests in flight at once, which
+                is also the number of worker threads used for the blocking API calls.
+                Must be at least 1.
+            cache_dir: Directory for cached API results, or None to disable caching
+            cache_max_bytes: Size above which least recently used cache entries are evicted
+            include_labels: Also request label detection and return a "labels" list
+                per frame. Labels are not used for validation, so this is off by default.
+            max_dim: Downscale frames read from disk so their longest side is at most
+                this many pixels before upload, or None to upload them unchanged
         """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be a positive integer, got {max_concurrency}")
+        
         self.api_key = api_key or os.environ.get("GEMINI_API_KEY")
         self.project_id = project_id or os.environ.get("GOOGLE_CLOUD_PROJECT")
+        self.max_concurrency = max_concurrency
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        self.cache_max_bytes = cache_max_bytes
+        # Cache writes since the last eviction pass, shared by worker threads
+        self._cache_lock = threading.Lock()
+        self._cache_writes = 0
+        self.include_labels = include_labels
+        self.max_dim = max_dim
+        # Results depend on the requested features and on the upload size, so
+        # each combination is cached separately
+        size_tag = f"max{max_dim}" if max_dim and PIL_AVAILABLE else "full"
+        self._vision_cache_prefix = f"vision_labels_{size_tag}" if include_labels else f"vision_{size_tag}"
+        self._gemini_cache_prefix = f"gemini_{size_tag}"
         
         # Initialize Vision API client
         if VISION_AVAILABLE and self.project_id:
-            self.vision_client = vision.ImageAnnotatorClient()
+            self.vision_client = _vision_client(self.project_id)
             logger.info("Google Cloud Vision API initialized successfully")
         else:
             self.vision_client = None
@@ -64,8 +249,7 @@ class SceneValidator:
             
         # Initialize Gemini API
         if GEMINI_AVAILABLE and self.api_key:
-            genai.configure(api_key=self.api_key)
-            self.gemini_model = genai.GenerativeModel('gemini-pro-vision')
+            self.gemini_model = _gemini_model(self.api_key)
             logger.info("Gemini API initialized successfully")
         else:
             self.gemini_model = None
@@ -84,48 +268,205 @@ class SceneValidator:
             logger.error("Vision API client not initialized")
             return {"error": "Vision API client not initialized"}
         
-        try:
-            with open(image_path, "rb") as image_file:
-                content = image_file.read()
+        # Only load the file into memory if there is no cached result for it
+        key, cached, content = self._fetch(image_path, self._vision_cache_prefix)
+        if cached is not None:
+            logger.info(f"Using cached analysis for frame: {image_path}")
+            return cached
+        if content is None:
+            return {"error": f"Could not read image: {image_path}"}
+        return self._annotate_upload(content, image_path, key)
+    
+    def analyze_frame_bytes(self, content: bytes, name: str = "<bytes>",
+                            key: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze a single frame, already loaded into memory, using Vision API.
+        
+        The image is downscaled to max_dim before upload, as for files on disk.
+        
+        Args:
+            content: Encoded image bytes
+            name: Label for the frame used in log messages
+            key: Precomputed cache key for content, if already known
             
+        Returns:
+            Dictionary containing analysis results
+        """
+        if not self.vision_client:
+            logger.error("Vision API client not initialized")
+            return {"error": "Vision API client not initialized"}
+        
+        if key is None:
+            key = self._content_key(content)
+        cached = self._cache_get(self._vision_cache_prefix, key)
+        if cached is not None:
+            logger.info(f"Using cached analysis for frame: {name}")
+            return cached
+        return self._annotate_upload(self._downscale_image(content), name, key)
+    
+    def _annotate_upload(self, content: bytes, name: str, key: Optional[str]) -> Dict[str, Any]:
+        """Send already-downscaled bytes to Vision API and cache the result under key.
+        
+        Callers must have checked the cache for key already.
+        """
+        try:
             image = vision.Image(content=content)
             response = self.vision_client.annotate_image({
                 'image': image,
-                'features': [
-                    {'type_': vision.Feature.Type.OBJECT_LOCALIZATION},
-                    {'type_': vision.Feature.Type.LABEL_DETECTION},
-                    {'type_': vision.Feature.Type.IMAGE_PROPERTIES},
-                ]
+                'features': self._vision_features()
             })
             
-            # Extract relevant information
-            result = {
-                "objects": [{
-                    "name": obj.name,
-                    "confidence": obj.score,
-                    "bounding_box": [
-                        {"x": vertex.x, "y": vertex.y}
-                        for vertex in obj.bounding_poly.normalized_vertices
-                    ]
-                } for obj in response.localized_object_annotations],
-                "labels": [{
-                    "description": label.description,
-                    "confidence": label.score
-                } for label in response.label_annotations],
-                "colors": [{
-                    "color": [c.red, c.green, c.blue],
-                    "score": color.score,
-                    "pixel_fraction": color.pixel_fraction
-                } for color in response.image_properties_annotation.dominant_colors.colors]
-            }
-            
-            logger.info(f"Successfully analyzed frame: {image_path}")
+            result = self._parse_vision_response(response)
+            self._cache_put(self._vision_cache_prefix, key, result)
+            logger.info(f"Successfully analyzed frame: {name}")
             return result
             
         except Exception as e:
             logger.error(f"Error analyzing frame: {e}")
             return {"error": str(e)}
     
+    def analyze_frames_batch(self, image_paths: List[str]) -> List[Dict[str, Any]]:
+        """Analyze several frames using batched Vision API requests.
+        
+        Frames are sent in chunks of VISION_BATCH_SIZE, so N frames cost
+        ceil(N / VISION_BATCH_SIZE) round-trips instead of N.
+        
+        Args:
+            image_paths: Paths to the image files
+            
+        Returns:
+            List of analysis results, in the same order as image_paths
+        """
+        if not self.vision_client:
+            logger.error("Vision API client not initialized")
+            return [{"error": "Vision API client not initialized"} for _ in image_paths]
+        
+        starts = range(0, len(image_paths), VISION_BATCH_SIZE)
+        if not starts:
+            return []
+        
+        def fetch(path: str) -> _Fetched:
+            return self._fetch(path, self._vision_cache_prefix)
+        
+        results = []
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(starts))) as executor:
+            for chunk_results in executor.map(
+                lambda start: self._annotate_batch(image_paths[start:start + VISION_BATCH_SIZE], fetch),
+                starts
+            ):
+                results.extend(chunk_results)
+        return results
+    
+    def _annotate_batch(self, names: List[str], fetch: Callable[[str], _Fetched]) -> List[Dict[str, Any]]:
+        """Send a single batch_annotate_images request for up to VISION_BATCH_SIZE frames.
+        
+        fetch(name) returns the frame's cache key, its cached result, and, on a
+        cache miss, its upload bytes (see _fetch). Only misses are sent.
+        """
+        if not self.vision_client:
+            logger.error("Vision API client not initialized")
+            return [{"error": "Vision API client not initialized"} for _ in names]
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(names)
+        pending = []  # (index, cache key) of frames that must be sent to the API
+        
+        try:
+            requests = []
+            for i, name in enumerate(names):
+                key, cached, content = fetch(name)
+                if cached is not None:
+                    logger.info(f"Using cached analysis for frame: {name}")
+                    results[i] = cached
+                    continue
+                if content is None:
+                    results[i] = {"error": f"Could not read image: {name}"}
+                    continue
+                
+                pending.append((i, key))
+                requests.append(vision.AnnotateImageRequest(
+                    image=vision.Image(content=content),
+                    features=self._vision_features()
+                ))
+            
+            if requests:
+                response = self.vision_client.batch_annotate_images(requests=requests)
+        except Exception as e:
+            logger.error(f"Error analyzing frame batch: {e}")
+            # Keep cache hits and read errors already resolved; only the rest failed
+            return [{"error": str(e)} if r is None else r for r in results]
+        
+        if requests:
+            for (i, key), image_response in zip(pending, response.responses):
+                if image_response.error.message:
+                    logger.error(f"Error analyzing frame {names[i]}: {image_response.error.message}")
+                    results[i] = {"error": image_response.error.message}
+                else:
+                    results[i] = self._parse_vision_response(image_response)
+                    self._cache_put(self._vision_cache_prefix, key, results[i])
+                    logger.info(f"Successfully analyzed frame: {names[i]}")
+            for i, _ in pending[len(response.responses):]:
+                logger.error(f"No Vision API response for frame: {names[i]}")
+                results[i] = {"error": "No response from Vision API"}
+        return results
+    
+    def _vision_features(self) -> List[Dict[str, Any]]:
+        """Vision API features requested for each frame."""
+        features = [
+            {'type_': vision.Feature.Type.OBJECT_LOCALIZATION, 'max_results': VISION_MAX_OBJECTS},
+            {'type_': vision.Feature.Type.IMAGE_PROPERTIES},
+        ]
+        if self.include_labels:
+            features.append({'type_': vision.Feature.Type.LABEL_DETECTION})
+        return features
+    
+    def _parse_vision_response(self, response: Any) -> Dict[str, Any]:
+        """Extract relevant information from a Vision API image response."""
+        # Resolve each proto field once; proto attribute access is comparatively slow
+        objects = response.localized_object_annotations
+        colors = response.image_properties_annotation.dominant_colors.colors
+        
+        result = {
+            "objects": [{
+                "name": obj.name,
+                "confidence": obj.score,
+                # (x, y) tuples rather than one dict per vertex
+                "bounding_box": [
+                    (vertex.x, vertex.y)
+                    for vertex in obj.bounding_poly.normalized_vertices
+                ]
+            } for obj in objects],
+            "colors": [{
+                "color": [color.color.red, color.color.green, color.color.blue],
+                "score": color.score,
+                "pixel_fraction": color.pixel_fraction
+            } for color in colors]
+        }
+        if self.include_labels:
+            result["labels"] = [{
+                "description": label.description,
+                "confidence": label.score
+            } for label in response.label_annotations]
+        return result
+    
+    async def _analyze_frames_batch_async(self, names: List[str], fetch: Callable[[str], _Fetched],
+                                          executor: Executor) -> List[Dict[str, Any]]:
+        """Analyze frames in VISION_BATCH_SIZE chunks, with chunks in flight concurrently."""
+        loop = asyncio.get_running_loop()
+        
+        async def annotate_chunk(start: int) -> List[Dict[str, Any]]:
+            # Submitted to the executor only once the semaphore admits this chunk
+            return await loop.run_in_executor(
+                executor,
+                self._annotate_batch,
+                names[start:start + VISION_BATCH_SIZE],
+                fetch
+            )
+        
+        chunk_results = await _bounded_gather(
+            [annotate_chunk(start) for start in range(0, len(names), VISION_BATCH_SIZE)],
+            self.max_concurrency
+        )
+        return [result for chunk_result in chunk_results for result in chunk_result]
+    
     def compare_frames(self, frame1_analysis: Dict[str, Any], frame2_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Compare two frames to check for continuity issues.
         
@@ -136,22 +477,28 @@ class SceneValidator:
         Returns:
             Dictionary containing comparison results and potential continuity issues
         """
+        return self._compare_frames(
+            frame1_analysis, frame2_analysis,
+            self._color_arrays(frame1_analysis), self._color_arrays(frame2_analysis)
+        )
+    
+    def _compare_frames(self, frame1_analysis: Dict[str, Any], frame2_analysis: Dict[str, Any],
+                        colors1: Tuple[np.ndarray, np.ndarray],
+                        colors2: Tuple[np.ndarray, np.ndarray]) -> Dict[str, Any]:
+        """compare_frames with each frame's dominant-color arrays precomputed by _color_arrays."""
         if "error" in frame1_analysis or "error" in frame2_analysis:
             return {"error": "Cannot compare frames due to analysis errors"}
         
-        # Simple object comparison
-        frame1_objects = {obj["name"]: obj for obj in frame1_analysis["objects"]}
-        frame2_objects = {obj["name"]: obj for obj in frame2_analysis["objects"]}
+        # Simple object comparison by name
+        frame1_names = {obj["name"] for obj in frame1_analysis["objects"]}
+        frame2_names = {obj["name"] for obj in frame2_analysis["objects"]}
         
-        # Find missing and new objects
-        missing_objects = [name for name in frame1_objects if name not in frame2_objects]
-        new_objects = [name for name in frame2_objects if name not in frame1_objects]
+        # Find missing and new objects (sorted so output is stable across runs)
+        missing_objects = sorted(frame1_names - frame2_names)
+        new_objects = sorted(frame2_names - frame1_names)
         
         # Compare dominant colors
-        color_difference = self._calculate_color_difference(
-            frame1_analysis["colors"],
-            frame2_analysis["colors"]
-        )
+        color_difference = self._calculate_color_difference(*colors1, *colors2)
         
         result = {
             "missing_objects": missing_objects,
@@ -165,27 +512,37 @@ class SceneValidator:
         logger.info(f"Frames comparison completed. Continuity score: {result['continuity_score']}")
         return result
     
-    def _calculate_color_difference(self, colors1: List[Dict], colors2: List[Dict]) -> float:
+    def _color_arrays(self, analysis: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the (k, 3) uint8 RGB and (k,) float32 score arrays of a frame's dominant colors.
+        
+        Analyses that failed have no colors and yield empty arrays.
+        """
+        colors = analysis.get("colors", [])
+        return (
+            _quantize_rgb([c["color"] for c in colors]),
+            np.array([c["score"] for c in colors], dtype=np.float32)
+        )
+    
+    def _calculate_color_difference(self, rgb1: np.ndarray, scores1: np.ndarray,
+                                    rgb2: np.ndarray, scores2: np.ndarray) -> float:
         """Calculate the difference between dominant colors of two frames."""
-        if not colors1 or not colors2:
+        if not len(rgb1) or not len(rgb2):
             return 1.0
         
         # Simplified color comparison - average difference of top 3 colors
-        top_colors1 = colors1[:min(3, len(colors1))]
-        top_colors2 = colors2[:min(3, len(colors2))]
+        rgb1, scores1 = rgb1[:3], scores1[:3]
+        rgb2, scores2 = rgb2[:3], scores2[:3]
         
-        total_diff = 0
-        count = 0
+        # Pairwise (k1, k2) absolute RGB difference in integer math; the sum of
+        # three 8-bit differences is at most 765, so int16 cannot overflow
+        diff = np.abs(
+            rgb1.astype(np.int16)[:, None, :] - rgb2.astype(np.int16)[None, :, :]
+        ).sum(axis=-1, dtype=np.int16)
         
-        for c1 in top_colors1:
-            for c2 in top_colors2:
-                r_diff = abs(c1["color"][0] - c2["color"][0])
-                g_diff = abs(c1["color"][1] - c2["color"][1])
-                b_diff = abs(c1["color"][2] - c2["color"][2])
-                total_diff += (r_diff + g_diff + b_diff) / (3 * 255) * c1["score"] * c2["score"]
-                count += 1
+        # Normalization folded into the score weights, applied once in float32
+        weights = (scores1[:, None] * scores2[None, :]) * np.float32(1.0 / (3 * 255))
         
-        return total_diff / max(1, count)
+        return float((diff * weights).sum() / diff.size)
     
     def _calculate_continuity_score(self, missing_count: int, new_count: int, color_diff: float) -> float:
         """Calculate an overall continuity score."""
@@ -211,6 +568,22 @@ class SceneValidator:
         Args:
             image_path: Path to the image file
             
+        Returns:
+            Dictionary containing Gemini's analysis
+        """
+        return self._get_gemini_analysis_cached(image_path, lambda path: self._fetch(path, self._gemini_cache_prefix))
+    
+    def get_gemini_analysis_bytes(self, image_data: bytes, name: str = "<bytes>",
+                                  key: Optional[str] = None) -> Dict[str, Any]:
+        """Get Gemini API analysis of a scene, already loaded into memory.
+        
+        The image is downscaled to max_dim before upload, as for files on disk.
+        
+        Args:
+            image_data: Encoded image bytes
+            name: Label for the frame used in log messages
+            key: Precomputed cache key for image_data, if already known
+            
         Returns:
             Dictionary containing Gemini's analysis
         """
@@ -218,10 +591,20 @@ class SceneValidator:
             logger.error("Gemini API not initialized")
             return {"error": "Gemini API not initialized"}
         
+        if key is None:
+            key = self._content_key(image_data)
+        cached = self._cache_get(self._gemini_cache_prefix, key)
+        if cached is not None:
+            logger.info(f"Using cached Gemini analysis for: {name}")
+            return cached
+        return self._gemini_upload(self._downscale_image(image_data), name, key)
+    
+    def _gemini_upload(self, image_data: bytes, name: str, key: Optional[str]) -> Dict[str, Any]:
+        """Send already-downscaled bytes to Gemini and cache the result under key.
+        
+        Callers must have checked the cache for key already.
+        """
         try:
-            with open(image_path, "rb") as img_file:
-                image_data = img_file.read()
-            
             prompt = """
             Analyze this frame from a video and provide feedback on:
             1. Scene composition quality (rule of thirds, balance, framing)
@@ -237,22 +620,244 @@ class SceneValidator:
             )
             
             # Extract JSON from response
-            try:
-                analysis = json.loads(response.text)
-                logger.info(f"Successfully got Gemini analysis for: {image_path}")
-                return analysis
-            except json.JSONDecodeError:
-                # Fallback if response is not valid JSON
+            analysis = _parse_json_response(response.text)
+            if analysis is None:
+                # Fallback if response contains no valid JSON; not cached, so the
+                # frame is retried on the next run
                 logger.warning(f"Gemini did not return valid JSON. Using raw response.")
                 return {"raw_analysis": response.text}
+            
+            logger.info(f"Successfully got Gemini analysis for: {name}")
+            self._cache_put(self._gemini_cache_prefix, key, analysis)
+            return analysis
                 
         except Exception as e:
             logger.error(f"Error getting Gemini analysis: {e}")
             return {"error": str(e)}
 
+    def _get_gemini_analysis_cached(self, name: str, fetch: Callable[[str], _Fetched]) -> Dict[str, Any]:
+        """Return the cached Gemini analysis of a frame, calling the API only on a miss.
+        
+        fetch(name) returns the frame's cache key, its cached result, and, on a
+        cache miss, its upload bytes (see _fetch).
+        """
+        if not self.gemini_model:
+            logger.error("Gemini API not initialized")
+            return {"error": "Gemini API not initialized"}
+        
+        key, cached, image_data = fetch(name)
+        if cached is not None:
+            logger.info(f"Using cached Gemini analysis for: {name}")
+            return cached
+        if image_data is None:
+            return {"error": f"Could not read image: {name}"}
+        return self._gemini_upload(image_data, name, key)
+    
+    async def _get_gemini_analysis_async(self, name: str, fetch: Callable[[str], _Fetched],
+                                         executor: Executor) -> Dict[str, Any]:
+        """Run _get_gemini_analysis_cached in a worker thread so calls can overlap."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self._get_gemini_analysis_cached, name, fetch)
+    
+    def _fetch(self, image_path: str, prefix: str) -> _Fetched:
+        """Hash an image file, look up its cached result and load it on a miss.
+        
+        The file is hashed through a read-only memory map, so a cache hit never
+        copies the image into memory; on a miss the upload bytes are copied from
+        the same mapping and downscaled to max_dim. Runs on worker threads.
+        
+        Returns:
+            (key, cached, content): content is None on a cache hit. All three are
+            None if the file cannot be read.
+        """
+        try:
+            with open(image_path, "rb") as image_file:
+                # Empty files cannot be memory-mapped
+                size = os.fstat(image_file.fileno()).st_size
+                mapping = mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+                try:
+                    data = mapping if mapping is not None else b""
+                    key = self._content_key(data)
+                    cached = self._cache_get(prefix, key)
+                    if cached is not None:
+                        return key, cached, None
+                    content = bytes(data)
+                finally:
+                    if mapping is not None:
+                        mapping.close()
+        except OSError as e:
+            logger.error(f"Error reading image {image_path}: {e}")
+            return None, None, None
+        
+        return key, None, self._downscale_image(content)
+    
+    def _downscale_image(self, content: bytes) -> bytes:
+        """Shrink an encoded image so its longest side is at most max_dim.
+        
+        The image is re-encoded as JPEG. The original bytes are returned when
+        downscaling is disabled, Pillow is missing, the image is already small
+        enough or cannot be decoded, or re-encoding would not make it smaller.
+        """
+        if not self.max_dim or not PIL_AVAILABLE:
+            return content
+        
+        try:
+            with Image.open(io.BytesIO(content)) as img:
+                if max(img.size) <= self.max_dim:
+                    return content
+                # Re-encoding drops EXIF, so apply its orientation to the pixels first
+                img = ImageOps.exif_transpose(img)
+                img.thumbnail((self.max_dim, self.max_dim))
+                if img.mode not in ("RGB", "L"):
+                    img = img.convert("RGB")
+                buffer = io.BytesIO()
+                img.save(buffer, "JPEG", quality=DOWNSCALE_JPEG_QUALITY)
+        except Exception as e:
+            logger.warning(f"Could not downscale image, uploading original: {e}")
+            return content
+        
+        resized = buffer.getvalue()
+        return resized if len(resized) < len(content) else content
+
+    def _content_key(self, content: Any) -> Optional[str]:
+        """Cache key for image bytes (any buffer), or None when caching is disabled."""
+        if not self.cache_dir:
+            return None
+        return hashlib.sha256(content).hexdigest()
+    
+    def _cache_path(self, prefix: str, key: str) -> str:
+        """Path of the cache entry for an image hash."""
+        return os.path.join(self.cache_dir, f"{prefix}_{key}.json")
+    
+    def _cache_get(self, prefix: str, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Load a cached API result, or None on a miss or when caching is disabled."""
+        if not self.cache_dir or key is None:
+            return None
+        
+        path = self._cache_path(prefix, key)
+        try:
+            with open(path, "rb") as f:
+                value = _loads(f.read())
+            # Bump the access time explicitly; atime is not updated on noatime mounts
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        
+        # Gemini responses without parseable JSON are no longer cached, but older
+        # runs stored them as raw_analysis; recover them or treat them as misses
+        if isinstance(value, dict) and "raw_analysis" in value:
+            return _parse_json_response(value["raw_analysis"])
+        return value
+    
+    def _cache_put(self, prefix: str, key: Optional[str], value: Dict[str, Any]) -> None:
+        """Atomically store an API result. Error results are never cached."""
+        if not self.cache_dir or key is None or "error" in value:
+            return
+        
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(_dumps(value))
+            os.replace(tmp_path, self._cache_path(prefix, key))
+            tmp_path = None
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write cache entry: {e}")
+            return
+        finally:
+            if tmp_path:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+        
+        # Scanning the whole directory is expensive, so size checks are batched:
+        # validate_scene_sequence evicts once per run, other callers every
+        # CACHE_EVICT_INTERVAL writes
+        with self._cache_lock:
+            self._cache_writes += 1
+            evict = self._cache_writes >= CACHE_EVICT_INTERVAL
+        if evict:
+            self._evict_cache()
+    
+    def _evict_cache(self) -> None:
+        """Delete least recently used cache entries until under cache_max_bytes.
+        
+        Temporary files left behind by interrupted writes are removed once they
+        are older than STALE_TMP_SECONDS; younger ones count towards the size.
+        """
+        with self._cache_lock:
+            self._cache_writes = 0
+        
+        stale_before = time.time() - STALE_TMP_SECONDS
+        try:
+            entries = []
+            total = 0
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(".json"):
+                        stat = entry.stat()
+                        entries.append((stat.st_atime, stat.st_size, entry.path))
+                        total += stat.st_size
+                    elif entry.name.endswith(".tmp"):
+                        stat = entry.stat()
+                        if stat.st_mtime < stale_before:
+                            try:
+                                os.remove(entry.path)
+                                continue
+                            except OSError:
+                                pass
+                        total += stat.st_size
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Could not scan cache directory: {e}")
+            return
+        
+        if total <= self.cache_max_bytes:
+            return
+        
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.cache_max_bytes:
+                break
+    
     def validate_scene_sequence(self, frame_paths: List[str]) -> Dict[str, Any]:
         """Validate a sequence of frames for continuity and composition.
         
+        Blocking wrapper around validate_scene_sequence_async. When called from
+        inside a running event loop (e.g. a notebook), the sequence is validated
+        on a separate thread with its own loop; awaiting the async variant
+        directly avoids blocking that loop.
+        
+        Args:
+            frame_paths: List of paths to frame images in sequence
+            
+        Returns:
+            Dictionary containing validation results
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.validate_scene_sequence_async(frame_paths))
+        
+        # asyncio.run() refuses to nest inside a running loop; give it a thread of its own
+        with ThreadPoolExecutor(max_workers=1) as runner:
+            return runner.submit(
+                lambda: asyncio.run(self.validate_scene_sequence_async(frame_paths))
+            ).result()
+
+    async def validate_scene_sequence_async(self, frame_paths: List[str]) -> Dict[str, Any]:
+        """Validate a sequence of frames for continuity and composition.
+        
+        All Vision requests are issued concurrently, followed by all Gemini
+        requests, so wall time tracks the slowest request rather than the sum.
+        
         Args:
             frame_paths: List of paths to frame images in sequence
             
@@ -262,45 +867,104 @@ class SceneValidator:
         if len(frame_paths) < 2:
             return {"error": "Need at least 2 frames to validate a sequence"}
         
+        # Blocking API calls run on a dedicated pool sized to the concurrency limit;
+        # the event loop's default executor may have fewer threads than that
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                      thread_name_prefix="SceneValidator")
+        try:
+            result = await self._validate_scene_sequence(frame_paths, executor)
+            if self._cache_writes:
+                await asyncio.get_running_loop().run_in_executor(executor, self._evict_cache)
+            return result
+        finally:
+            executor.shutdown(wait=False)
+    
+    async def _validate_scene_sequence(self, frame_paths: List[str], executor: Executor) -> Dict[str, Any]:
+        """Body of validate_scene_sequence_async, with API calls dispatched to executor."""
+        # Frames are hashed and read on the worker threads, not the event loop.
+        # Keys from the Vision pass are reused by Gemini. Upload bytes are only
+        # kept for the first and last frames, which always go to Gemini, so
+        # memory stays bounded by the batches in flight rather than the sequence
+        # length; problem frames are re-read if their Gemini result is not cached.
+        keys: Dict[str, Optional[str]] = {}
+        contents: Dict[str, bytes] = {}
+        keep = {frame_paths[0], frame_paths[-1]} if self.gemini_model else set()
+        
+        def fetch_vision(path: str) -> _Fetched:
+            key, cached, content = self._fetch(path, self._vision_cache_prefix)
+            keys[path] = key
+            if content is not None and path in keep:
+                contents[path] = content
+            return key, cached, content
+        
+        def fetch_gemini(path: str) -> _Fetched:
+            if path in keys:
+                key = keys[path]
+                cached = self._cache_get(self._gemini_cache_prefix, key)
+                if cached is not None:
+                    return key, cached, None
+                if path in contents:
+                    return key, None, contents.pop(path)
+            return self._fetch(path, self._gemini_cache_prefix)
+        
         # Analyze all frames
-        frame_analyses = [self.analyze_frame(path) for path in frame_paths]
+        frame_analyses = await self._analyze_frames_batch_async(frame_paths, fetch_vision, executor)
         
-        # Compare consecutive frames
+        # Compare consecutive frames; color arrays are built once per frame
+        # rather than once per comparison
+        color_arrays = [self._color_arrays(analysis) for analysis in frame_analyses]
         comparisons = [
-            self.compare_frames(frame_analyses[i], frame_analyses[i+1])
+            self._compare_frames(frame_analyses[i], frame_analyses[i+1], color_arrays[i], color_arrays[i+1])
             for i in range(len(frame_analyses) - 1)
         ]
         
         # Get composition analysis for key frames (first, last, and any with low continuity)
-        composition_analyses = {}
-        composition_analyses["first"] = self.get_gemini_analysis(frame_paths[0])
-        composition_analyses["last"] = self.get_gemini_analysis(frame_paths[-1])
+        gemini_targets = {"first": frame_paths[0], "last": frame_paths[-1]}
         
-        # Find frames with continuity issues
+        # Collect scores and find frames with continuity issues in a single pass
+        continuity_scores = []
+        total_continuity = 0.0
         problem_frames = []
         for i, comp in enumerate(comparisons):
-            if "continuity_score" in comp and comp["continuity_score"] < 0.7:
+            score = comp.get("continuity_score", 0)
+            continuity_scores.append(score)
+            total_continuity += score
+            if "continuity_score" in comp and score < 0.7:
                 problem_frames.append(i+1)  # +1 because it's the second frame in comparison
                 if len(problem_frames) < 3:  # Limit to analyzing max 3 problem frames
-                    composition_analyses[f"problem_{i+1}"] = self.get_gemini_analysis(frame_paths[i+1])
+                    gemini_targets[f"problem_{i+1}"] = frame_paths[i+1]
+        average_continuity = total_continuity / max(1, len(comparisons))
+        
+        # A frame can be both a key frame and a problem frame (or listed twice);
+        # request each distinct frame once and fan the result out to every label
+        gemini_paths = list(dict.fromkeys(gemini_targets.values()))
+        gemini_results = await _bounded_gather(
+            [
+                self._get_gemini_analysis_async(path, fetch_gemini, executor)
+                for path in gemini_paths
+            ],
+            self.max_concurrency
+        )
+        results_by_path = dict(zip(gemini_paths, gemini_results))
+        composition_analyses = {label: results_by_path[path] for label, path in gemini_targets.items()}
         
         result = {
             "frame_count": len(frame_paths),
-            "continuity_scores": [c.get("continuity_score", 0) for c in comparisons],
-            "average_continuity": sum(c.get("continuity_score", 0) for c in comparisons) / max(1, len(comparisons)),
+            "continuity_scores": continuity_scores,
+            "average_continuity": average_continuity,
             "problem_frames": problem_frames,
             "composition_analyses": composition_analyses,
             "validation_summary": self._generate_validation_summary(
-                comparisons, composition_analyses, problem_frames
+                comparisons, composition_analyses, problem_frames, average_continuity
             )
         }
         
         logger.info(f"Completed validation of {len(frame_paths)} frames")
         return result
     
-    def _generate_validation_summary(self, comparisons: List[Dict], composition_analyses: Dict, problem_frames: List[int]) -> Dict:
+    def _generate_validation_summary(self, comparisons: List[Dict], composition_analyses: Dict,
+                                     problem_frames: List[int], avg_continuity: float) -> Dict:
         """Generate a summary of the validation results."""
-        avg_continuity = sum(c.get("continuity_score", 0) for c in comparisons) / max(1, len(comparisons))
         
         first_frame_quality = 0
         if "first" in composition_analyses and "overall_rating" in composition_analyses["first"]:
@@ -357,6 +1021,28 @@ class SceneValidator:
         
         return recommendations
 
+def _configure_logging() -> None:
+    """Log to the console and, in batches, to scene_validator.log.
+    
+    Called from main() only, so importing this module as a library does not
+    create a log file. File records are flushed when the buffer fills, on any
+    ERROR record, and at interpreter exit.
+    """
+    # One formatter for both outputs; the MemoryHandler never formats records itself
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler("scene_validator.log")
+    file_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        handlers=[
+            logging.handlers.MemoryHandler(LOG_BUFFER_CAPACITY, target=file_handler),
+            console_handler
+        ]
+    )
+
 def main():
     """Main function to run the tool from command line."""
     parser = argparse.ArgumentParser(description="SceneValidator: Validate scene composition and continuity")
@@ -364,18 +1050,33 @@ def main():
     parser.add_argument("--output", help="Path to output JSON file")
     parser.add_argument("--api-key", help="Gemini API key")
     parser.add_argument("--project-id", help="Google Cloud project ID")
+    parser.add_argument("--workers", "--concurrency", dest="workers", type=int,
+                        default=DEFAULT_MAX_CONCURRENCY,
+                        help="Number of worker threads, i.e. maximum API requests in flight at once")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory for cached API results")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the API result cache")
+    parser.add_argument("--max-dim", type=int, default=DEFAULT_MAX_DIM,
+                        help="Downscale frames to at most this many pixels per side before upload (0 to disable)")
     args = parser.parse_args()
     
-    validator = SceneValidator(api_key=args.api_key, project_id=args.project_id)
-    result = validator.validate_scene_sequence(args.frames)
+    _configure_logging()
+    try:
+        validator = SceneValidator(api_key=args.api_key, project_id=args.project_id,
+                                   max_concurrency=args.workers,
+                                   cache_dir=None if args.no_cache else args.cache_dir,
+                                   max_dim=args.max_dim or None)
+    except ValueError as e:
+        parser.error(f"--workers: {e}")
+    result = asyncio.run(validator.validate_scene_sequence_async(args.frames))
     
     # Pretty print to console
-    print(json.dumps(result, indent=2))
+    output = _dumps(result, indent=True)
+    print(output)
     
     # Save to file if requested
     if args.output:
-        with open(args.output, "w") as f:
-            json.dump(result, f, indent=2)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
         print(f"Results saved to {args.output}")
 
 if __name__ == "__main__":